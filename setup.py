@@ -10,6 +10,12 @@ setup(
         "botocore>=1.34.0",
     ],
     extras_require={
+        "fast": [
+            "fastcrc>=0.4.0",
+            "crc32c>=2.7",
+            "isal>=1.0.0",
+            "orjson>=3.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.20.0",
@@ -4,20 +4,70 @@ import boto3
 import zlib
 import os
 import argparse
-import base64
+from binascii import a2b_base64, b2a_base64
 import json
 import struct
 import hashlib
+import mmap
+from functools import lru_cache
 from datetime import datetime
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ProfileNotFound, ClientError
 from botocore.response import StreamingBody
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import Optional, List, Union
+from typing import Optional, List, Union, NamedTuple
 import logging
 import sys
-from io import BytesIO, IOBase
+from io import BytesIO, RawIOBase, SEEK_SET, SEEK_CUR, SEEK_END
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    # Optional PCLMULQDQ-accelerated CRC32 (pip install s3-integrity[fast])
+    from fastcrc import crc32 as fastcrc32
+except ImportError:
+    fastcrc32 = None
+
+try:
+    # Optional ISA-L CRC32, used when fastcrc is not installed
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
+try:
+    # Optional SSE4.2/ARMv8 hardware CRC32C (pip install s3-integrity[fast])
+    from crc32c import crc32c as _crc32c
+except ImportError:
+    _crc32c = None
+
+try:
+    # Optional C JSON encoder for verbose response dumps
+    import orjson
+except ImportError:
+    orjson = None
+
+# Big-endian uint32 codec for CRC32 values, compiled once
+_U32BE = struct.Struct('>I')
+_pack_u32 = _U32BE.pack
+_unpack_u32 = _U32BE.unpack
+
+_sha256 = hashlib.sha256
+
+MiB = 1024 * 1024
+MIN_PART_SIZE = 5 * MiB  # S3 minimum for all but the last part
+DEFAULT_PART_SIZE = 8 * MiB
+LARGE_PART_SIZE = 16 * MiB
+LARGE_FILE_THRESHOLD = 1024 * MiB  # Switch to LARGE_PART_SIZE above this
+MAX_PARTS = 10000  # S3 limit on parts per multipart upload
+READ_BLOCK_SIZE = 256 * 1024  # Sub-block size for fused read + CRC32
+MAX_UPLOAD_WORKERS = 8  # Parts uploaded concurrently
+
+# Supported part checksum algorithms and the S3 field each one is sent/returned in
+CHECKSUM_KEYS = {
+    'crc32': 'ChecksumCRC32',
+    'crc32c': 'ChecksumCRC32C',
+}
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -56,6 +106,15 @@ class UploadPhase:
             
         return msg
 
+class CompletedPart(NamedTuple):
+    ETag: str
+    PartNumber: int
+    CRC: int
+
+    def to_dict(self, checksum_key: str = 'ChecksumCRC32') -> dict:
+        # Base64 only at the API boundary; the raw CRC is what the composite check needs
+        return {'ETag': self.ETag, 'PartNumber': self.PartNumber, checksum_key: crc32_to_b64(self.CRC)}
+
 class UploadResult:
     def __init__(self):
         self.phases: List[UploadPhase] = []
@@ -84,131 +143,294 @@ class UploadError(Exception):
         self.phase = phase
         super().__init__(self.phase.get_summary())
 
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, (StreamingBody, TransferConfig)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        if isinstance(obj, (StreamingBody, type(boto3.s3.transfer.TransferConfig))):
-            return str(obj)
-        return super(DateTimeEncoder, self).default(obj)
+        return _json_default(obj)
+
+if fastcrc32 is not None:
+    def _crc32(data, value: int = 0) -> int:
+        # Same seed/chaining semantics as zlib.crc32
+        return fastcrc32.iso_hdlc(data, value)
+elif isal_zlib is not None:
+    _crc32 = isal_zlib.crc32
+else:
+    _crc32 = zlib.crc32
+
+def get_crc_function(algorithm: str = 'crc32'):
+    """Return a zlib.crc32-compatible (data, value=0) function for the given algorithm."""
+    if algorithm == 'crc32':
+        return _crc32
+    if algorithm == 'crc32c':
+        if _crc32c is None:
+            raise ValueError("CRC32C checksums require the crc32c package (pip install crc32c)")
+        return _crc32c
+    raise ValueError(f"Unsupported checksum algorithm: {algorithm}")
 
 def compute_multipart_crc32(parts_data):
-    crc32_val = 0
-    for part_data in parts_data:
-        crc32_val = zlib.crc32(part_data, crc32_val) & 0xFFFFFFFF
+    # Peek rather than len() so generators and other iterators are still accepted
+    parts_iter = iter(parts_data)
+    crc32_val = _crc32(next(parts_iter, b''))
+    for part_data in parts_iter:
+        crc32_val = _crc32(part_data, crc32_val)
     
-    crc32_bytes = struct.pack('>I', crc32_val)
-    return base64.b64encode(crc32_bytes).decode('utf-8')
+    return crc32_to_b64(crc32_val)
 
 def compute_crc32(data: bytes) -> str:
-    checksum = zlib.crc32(data) & 0xFFFFFFFF
-    return base64.b64encode(checksum.to_bytes(4, 'big')).decode('utf-8')
+    return crc32_to_b64(_crc32(data))
+
+def crc32_to_b64(value: int) -> str:
+    # The precompiled Struct packs faster than int.to_bytes(4, 'big') on CPython 3.11
+    return b2a_base64(_pack_u32(value), newline=False).decode('ascii')
+
+def map_file(path: str, file_size: int):
+    """
+    Map a file read-only so parts can be sliced without copying through read(). Files
+    that cannot be mapped are opened unbuffered instead, so readinto() goes straight
+    from the kernel into the part buffer without a BufferedReader copy in between.
+    """
+    if not file_size:
+        # mmap cannot map an empty file
+        return BytesIO()
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return os.fdopen(fd, 'rb', buffering=0)
+    os.close(fd)  # mmap keeps its own handle
+    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mm.madvise(mmap.MADV_SEQUENTIAL)  # Enable aggressive kernel read-ahead
+    return mm
+
+class PartReader(RawIOBase):
+    """
+    Seekable read-only stream over a memoryview, so boto3 can send a part of a mapped
+    file block by block instead of it being copied into one bytes object up front.
+    """
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_CUR:
+            offset += self._pos
+        elif whence == SEEK_END:
+            offset += len(self._view)
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        data = bytes(self._view[self._pos:end])
+        self._pos += len(data)
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+def choose_part_size(file_size: int) -> int:
+    """
+    Use larger parts for big uploads to cut the number of upload_part round trips, growing
+    them in whole MiB past LARGE_PART_SIZE when needed to stay within MAX_PARTS.
+    """
+    if file_size <= LARGE_FILE_THRESHOLD:
+        return DEFAULT_PART_SIZE
+    min_part_size = -(-file_size // MAX_PARTS)
+    return max(LARGE_PART_SIZE, -(-min_part_size // MiB) * MiB)
+
+def read_part_with_crc32(data_source, buffer: bytearray, block_size: int = READ_BLOCK_SIZE,
+                         crc_func=_crc32):
+    """
+    Fill buffer from data_source, updating the CRC32 per block while the bytes are still
+    in cache. Returns (bytes_read, crc32).
+    """
+    crc32_val = 0
+    bytes_read = 0
+    with memoryview(buffer) as view:
+        while bytes_read < len(view):
+            n = data_source.readinto(view[bytes_read:bytes_read + block_size])
+            if not n:
+                break
+            crc32_val = crc_func(view[bytes_read:bytes_read + n], crc32_val)
+            bytes_read += n
+    return bytes_read, crc32_val
+
+def iter_mapped_parts(view: memoryview, part_size: int):
+    """
+    Yield (chunk, None) for each part of a mapped file. Slicing a memoryview is O(1) and
+    copies nothing; the upload worker computes each part's CRC itself.
+    """
+    for offset in range(0, len(view), part_size):
+        yield view[offset:offset + part_size], None
+
+def iter_buffered_parts(data_source, buffer_size: int, free_buffers: list, crc_func=_crc32):
+    """
+    Yield (buffer, crc32) for each part read from data_source. Buffers handed back through
+    free_buffers are reused so only as many exist as there are parts in flight.
+    """
+    while True:
+        buffer = free_buffers.pop() if free_buffers else bytearray(buffer_size)
+        chunk_size, crc32_val = read_part_with_crc32(data_source, buffer, crc_func=crc_func)
+        if not chunk_size:
+            return
+        if chunk_size < len(buffer):
+            # Final short part; truncate in place rather than copying a slice
+            del buffer[chunk_size:]
+        yield buffer, crc32_val
 
 def parse_s3_checksum(s3_checksum):
-    if '-' in s3_checksum:
-        return s3_checksum.split('-')[0]
-    return s3_checksum
+    # Drops the "-N" part-count suffix; partition leaves the string whole when absent
+    return s3_checksum.partition('-')[0]
 
 def compute_sha256(data):
-    return base64.b64encode(hashlib.sha256(data).digest()).decode('utf-8')
+    # Integrity check, not a security context: lets OpenSSL 3 skip the FIPS provider lookup
+    digest = _sha256(data, usedforsecurity=False).digest()
+    return b2a_base64(digest, newline=False).decode('ascii')
 
-def combine_multipart_checksums(part_checksums):
-    combined_crc = 0
-    for checksum in part_checksums:
-        crc_bytes = base64.b64decode(checksum)
-        combined_crc = zlib.crc32(crc_bytes, combined_crc) & 0xFFFFFFFF
-    
-    final_bytes = struct.pack('>I', combined_crc)
-    final_b64 = base64.b64encode(final_bytes).decode('utf-8')
-    return final_b64
+def combine_multipart_checksums(part_checksums, crc_func=_crc32):
+    # S3's composite checksum is the CRC of the concatenated part CRCs, so a single
+    # pass over the joined bytes replaces one call per part
+    crc_bytes = b''.join([a2b_base64(checksum) for checksum in part_checksums])
+    return crc32_to_b64(crc_func(crc_bytes))
+
+def combine_part_crcs(part_crcs, crc_func=_crc32) -> int:
+    """Composite CRC from raw part CRCs, packed big-endian in one call."""
+    return crc_func(struct.pack(f'>{len(part_crcs)}I', *part_crcs))
 
-def verify_uploaded_object(s3_client, bucket_name, object_key, parts, verbose=False):
+def verify_uploaded_object(s3_client, bucket_name, object_key, parts, verbose=False,
+                           checksum_algorithm='crc32', part_crcs=None):
+    """
+    Compare S3's composite checksum with one computed from the parts. part_crcs may carry
+    the parts' raw CRCs, in order, to skip decoding them from the base64 in parts.
+    """
     try:
-        response = s3_client.get_object(
+        # HEAD returns the same checksum metadata as GET without downloading the object
+        response = s3_client.head_object(
             Bucket=bucket_name,
             Key=object_key,
             ChecksumMode='ENABLED'
         )
         
-        # Consume the response body stream to prevent connection issues
-        try:
-            chunk_size = 8192 
-            body = response['Body']
-            while body.read(chunk_size):
-                pass
-        finally:
-            response['Body'].close()
-        
-        part_checksums = [part['ChecksumCRC32'] for part in parts]
-        calculated_checksum = combine_multipart_checksums(part_checksums)
-        s3_checksum = parse_s3_checksum(response.get('ChecksumCRC32', ''))
+        checksum_key = CHECKSUM_KEYS[checksum_algorithm]
+        if part_crcs is None:
+            part_crcs = [b64_to_u32(part[checksum_key]) for part in parts]
+        calculated_crc = combine_part_crcs(part_crcs, get_crc_function(checksum_algorithm))
+        s3_checksum = parse_s3_checksum(response.get(checksum_key, ''))
         
-        if s3_checksum != calculated_checksum:
-            return False, f"Checksum mismatch (Calculated: {calculated_checksum}, S3: {s3_checksum})"
+        if not s3_checksum or b64_to_u32(s3_checksum) != calculated_crc:
+            return False, f"Checksum mismatch (Calculated: {crc32_to_b64(calculated_crc)}, S3: {s3_checksum})"
         
         return True, None
         
     except Exception as e:
         return False, f"Verification error: {str(e)}"
 
-def verify_part_checksum(response, data, checksum, verbose=False):
+def b64_to_u32(b64_str) -> int:
+    return _unpack_u32(a2b_base64(b64_str))[0]
+
+def verify_part_checksum(response, data, checksum, verbose=False, algorithms=('crc32',)):
+    # Verbose diagnostics are shown at the default INFO level, like print_verbose's dumps;
+    # otherwise a mismatch is only recorded at DEBUG since the caller reports the error
+    log_level = logging.INFO if verbose else logging.DEBUG
     if verbose:
-        print("\nVerifying part checksums:")
+        logger.info("\nVerifying part checksums:")
     
-    returned_checksums = {k: v for k, v in response.items() if k.startswith('Checksum')}
+    crc_algorithm = 'crc32c' if 'crc32c' in algorithms else 'crc32'
+    crc_label = crc_algorithm.upper()
+    remote_crc32 = response.get(CHECKSUM_KEYS[crc_algorithm])
     
-    if 'ChecksumCRC32' in returned_checksums:
+    if remote_crc32 is not None:
         try:
-            
-            def b64_to_int(b64_str):
-                decoded = base64.b64decode(b64_str)
-                return struct.unpack('>I', decoded)[0]
-            
-            local_crc = b64_to_int(checksum)
-            remote_crc = b64_to_int(returned_checksums['ChecksumCRC32'])
-            
-            if remote_crc != local_crc:
-                error_msg = f"CRC32 mismatch:\n" \
-                           f"Local (hex): {hex(local_crc)}, (dec): {local_crc}\n" \
-                           f"S3    (hex): {hex(remote_crc)}, (dec): {remote_crc}"
-                if verbose:
-                    print(f"✗ {error_msg}")
-                return False, error_msg
-            elif verbose:
-                print(f"✓ CRC32 checksum match:")
-                print(f"  Hex: {hex(local_crc)}")
-                print(f"  Dec: {local_crc}")
-                print(f"  B64: {checksum}")
+            local_crc = b64_to_u32(checksum)
+            remote_crc = b64_to_u32(remote_crc32)
         except (ValueError, struct.error) as e:
-            error_msg = f"Invalid CRC32 format: {str(e)}"
-            if verbose:
-                print(f"✗ {error_msg}")
+            error_msg = f"Invalid {crc_label} format: {str(e)}"
+            logger.log(log_level, "✗ %s", error_msg)
+            return False, error_msg
+        
+        if remote_crc != local_crc:
+            # Only a mismatch pays for building the detailed message
+            error_msg = f"{crc_label} mismatch:\n" \
+                       f"Local (hex): {hex(local_crc)}, (dec): {local_crc}\n" \
+                       f"S3    (hex): {hex(remote_crc)}, (dec): {remote_crc}"
+            logger.log(log_level, "✗ %s", error_msg)
             return False, error_msg
+        if verbose:
+            logger.info("✓ %s checksum match:\n  Hex: %#x\n  Dec: %d\n  B64: %s",
+                        crc_label, local_crc, local_crc, checksum)
     
-    if 'ChecksumSHA256' in returned_checksums:
+    # Only hash the part when SHA256 was explicitly requested; the CRC is always checked
+    if 'sha256' not in algorithms:
+        return True, None
+    
+    remote_sha256 = response.get('ChecksumSHA256')
+    if remote_sha256 is not None:
         local_sha256 = compute_sha256(data)
-        if returned_checksums['ChecksumSHA256'] != local_sha256:
+        if remote_sha256 != local_sha256:
             # For SHA256, we'll keep hex only since decimal would be extremely long
             error_msg = f"SHA256 mismatch:\n" \
                        f"Local: {local_sha256}\n" \
-                       f"S3:    {returned_checksums['ChecksumSHA256']}"
-            if verbose:
-                print(f"✗ {error_msg}")
+                       f"S3:    {remote_sha256}"
+            logger.log(log_level, "✗ %s", error_msg)
             return False, error_msg
-        elif verbose:
-            print(f"✓ SHA256 checksum match:")
-            print(f"  {local_sha256}")
+        if verbose:
+            logger.info("✓ SHA256 checksum match:\n  %s", local_sha256)
     
     return True, None
 
-def create_s3_client(endpoint_url=None, access_key=None, secret_key=None, region=None, profile=None):
-    """Create an S3 client with the given configuration."""
-    session = boto3.Session(profile_name=profile) if profile else boto3.Session()
+def upload_one_part(s3_client, bucket_name, object_key, upload_id, part_number, chunk, crc=None,
+                    checksum_algorithm='crc32'):
+    """
+    Upload a single part. When crc is None it is computed here, so CRCs of different parts
+    run in parallel on the worker threads. Checking S3's response is left to the caller,
+    which handles finished parts one at a time. Returns (response, crc, checksum).
+    """
+    if crc is None:
+        crc = get_crc_function(checksum_algorithm)(chunk)
+    checksum = crc32_to_b64(crc)
+    
+    response = s3_client.upload_part(
+        Bucket=bucket_name,
+        Key=object_key,
+        PartNumber=part_number,
+        UploadId=upload_id,
+        # botocore only accepts bytes, bytearray or file-like bodies
+        Body=PartReader(chunk) if isinstance(chunk, memoryview) else chunk,
+        **{CHECKSUM_KEYS[checksum_algorithm]: checksum}
+    )
+    return response, crc, checksum
+
+def create_s3_client(endpoint_url=None, access_key=None, secret_key=None, region=None, profile=None,
+                     session=None):
+    """Create an S3 client with the given configuration, from session if one is given."""
+    if session is None:
+        session = boto3.Session(profile_name=profile) if profile else boto3.Session()
     
     config = Config(
         region_name=region if region != 'auto' else None,  # Don't use 'auto' as region
         signature_version='s3v4',
         retries={'max_attempts': 3},
+        max_pool_connections=max(MAX_UPLOAD_WORKERS * 2, 20),
         s3={
             'addressing_style': 'path'  # Force path-style addressing
         }
@@ -228,6 +450,23 @@ def create_s3_client(endpoint_url=None, access_key=None, secret_key=None, region
     
     return session.client('s3', **client_kwargs)
 
+@lru_cache(maxsize=8)
+def _cached_client(endpoint_url=None, access_key=None, secret_key=None, region=None, profile=None):
+    """
+    One client per configuration for the life of the process. Building a client loads the
+    service model and credential chain, which costs more than uploading a small object.
+    """
+    # One session serves both the region lookup and the client, so a missing profile
+    # falls back to the default credentials for both
+    session = get_session(profile)
+    return create_s3_client(
+        endpoint_url=endpoint_url,
+        access_key=access_key,
+        secret_key=secret_key,
+        region=region or session.region_name,
+        session=session
+    )
+
 def print_verbose(message: str, response: dict = None, verbose: bool = False):
     if not verbose:
         return
@@ -237,7 +476,12 @@ def print_verbose(message: str, response: dict = None, verbose: bool = False):
     
     if response:
         print("Response:")
-        print(json.dumps(response, cls=DateTimeEncoder, indent=2))
+        if orjson is not None:
+            # C encoder; handles datetime natively and only calls back for the rest. Unlike
+            # json.dumps it writes non-ASCII (e.g. in object keys) as UTF-8, not \u escapes
+            print(orjson.dumps(response, default=_json_default, option=orjson.OPT_INDENT_2).decode())
+        else:
+            print(json.dumps(response, cls=DateTimeEncoder, indent=2))
     print("\n" + "=" * 80 + "\n")
 
 def get_session(profile_name=None):
@@ -248,7 +492,7 @@ def get_session(profile_name=None):
         return boto3.Session()
 
 def multipart_upload(target_bucket: str, 
-                    source_data: Union[str, bytes, BytesIO],
+                    source_data: Union[str, bytes, bytearray, BytesIO],
                     destination_key: str,
                     is_file: bool = True,
                     endpoint_url: Optional[str] = None,
@@ -256,7 +500,9 @@ def multipart_upload(target_bucket: str,
                     aws_secret_access_key: Optional[str] = None,
                     region_name: Optional[str] = None,
                     profile_name: Optional[str] = None,
-                    verbose: bool = False) -> UploadResult:
+                    verbose: bool = False,
+                    part_size: Optional[int] = None,
+                    checksum_algorithm: str = 'crc32') -> UploadResult:
     """
     Enhanced multipart upload function that handles both file and text/bytes input
     """
@@ -264,115 +510,152 @@ def multipart_upload(target_bucket: str,
     upload_id = None
     
     try:
-        session = get_session(profile_name)
-        
-        if aws_access_key_id and aws_secret_access_key:
-            session = boto3.Session(
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                region_name=region_name
-            )
-        
-        s3 = create_s3_client(
-            endpoint_url=endpoint_url,
-            access_key=aws_access_key_id,
-            secret_key=aws_secret_access_key,
-            region=region_name or session.region_name
-        )
-        
-        part_size = 8 * 1024 * 1024  # 8MB chunks
-        
-        logger.info("\nInitiating multipart upload...")
-        result.start_phase(UploadStage.INIT.value)
-        try:
-            init_response = s3.create_multipart_upload(Bucket=target_bucket, Key=destination_key)
-            upload_id = init_response['UploadId']
-            result.end_phase(message="Upload initiated successfully")
-        except Exception as e:
-            result.end_phase(success=False, message="Failed to initiate upload", error=e)
-            raise UploadError(result.phases[-1])
-            
-        print_verbose("Create Multipart Upload Response:", init_response, verbose)
-        
-        parts = []
+        crc_func = get_crc_function(checksum_algorithm)
+        checksum_key = CHECKSUM_KEYS[checksum_algorithm]
+        s3 = _cached_client(endpoint_url, aws_access_key_id, aws_secret_access_key, region_name, profile_name)
         
         # Handle different input types
+        file_view = None
         if is_file:
             if isinstance(source_data, str):
                 file_size = os.path.getsize(source_data)
-                data_source = open(source_data, 'rb')
+                data_source = map_file(source_data, file_size)
+                if isinstance(data_source, mmap.mmap):
+                    file_size = len(data_source)  # The mapping wins if the file changed size
             else:
                 raise ValueError("File upload requires a string path")
         else:
-            # Convert text or bytes to BytesIO
+            # In-memory input is already addressable; slice a view of it like a mapped file
             if isinstance(source_data, str):
-                data_source = BytesIO(source_data.encode('utf-8'))
-            elif isinstance(source_data, bytes):
-                data_source = BytesIO(source_data)
-            elif isinstance(source_data, BytesIO):
+                data_source = source_data.encode('utf-8')
+            elif isinstance(source_data, (bytes, bytearray, BytesIO)):
                 data_source = source_data
             else:
                 raise ValueError("Invalid input type for text/bytes upload")
             
-            data_source.seek(0, 2)  # Seek to end
-            file_size = data_source.tell()
-            data_source.seek(0)  # Reset to beginning
+            file_view = data_source.getbuffer() if isinstance(data_source, BytesIO) else memoryview(data_source)
+            file_size = len(file_view)
+        
+        # Files opened here are closed on every exit path; in-memory input is the caller's
+        owns_source = is_file
+        in_flight = {}
         
         try:
-            part_number = 1
-            bytes_sent = 0
+            if part_size is None:
+                part_size = choose_part_size(file_size)
+            elif -(-file_size // part_size) > MAX_PARTS:
+                # Fail before any data is sent rather than at part MAX_PARTS + 1
+                raise ValueError(f"Part size {part_size} would need more than {MAX_PARTS} parts "
+                                 f"for {file_size} bytes")
             
-            while True:
-                chunk = data_source.read(part_size)
-                if not chunk:
-                    break
-                
-                checksum = compute_crc32(chunk)
-                
-                logger.info(f"Uploading part {part_number}...")
-                result.start_phase(UploadStage.PART_UPLOAD.value, part_number)
+            # Parts finish out of order; slot each one in by number instead of sorting later.
+            # A file read to EOF (no mmap) may change size, so this is resized as parts arrive
+            parts: List[Optional[CompletedPart]] = [None] * -(-file_size // part_size)
+            if isinstance(data_source, mmap.mmap):
+                file_view = memoryview(data_source)
+            
+            logger.info("\nInitiating multipart upload...")
+            result.start_phase(UploadStage.INIT.value)
+            try:
+                create_args = {'Bucket': target_bucket, 'Key': destination_key}
+                if checksum_algorithm != 'crc32':
+                    create_args['ChecksumAlgorithm'] = checksum_algorithm.upper()
+                init_response = s3.create_multipart_upload(**create_args)
+                upload_id = init_response['UploadId']
+                result.end_phase(message=f"Upload initiated successfully (part size: {part_size / MiB:g} MiB)")
+            except Exception as e:
+                result.end_phase(success=False, message="Failed to initiate upload", error=e)
+                raise UploadError(result.phases[-1])
                 
-                try:
-                    response = s3.upload_part(
-                        Bucket=target_bucket,
-                        Key=destination_key,
-                        PartNumber=part_number,
-                        UploadId=upload_id,
-                        Body=chunk,
-                        ChecksumCRC32=checksum
-                    )
-                    
-                    print_verbose(f"Upload Part {part_number} Response:", response, verbose)
+            print_verbose("Create Multipart Upload Response:", init_response, verbose)
+            
+            bytes_sent = 0
+            buffer_size = min(part_size, file_size)
+            free_buffers = []
+
+            def collect_parts(done):
+                nonlocal bytes_sent
+                for future in sorted(done, key=lambda f: in_flight[f][0]):
+                    # Left in in_flight until recycled so the cleanup below still sees it on error
+                    done_part_number, chunk = in_flight[future]
+                    result.start_phase(UploadStage.PART_UPLOAD.value, done_part_number)
                     
-                    success, error_msg = verify_part_checksum(response, chunk, checksum, verbose)
-                    if not success:
-                        result.end_phase(success=False, message=error_msg)
+                    try:
+                        response, crc32_val, checksum = future.result()
+                    except ClientError as e:
+                        error_code = e.response.get('Error', {}).get('Code', '')
+                        if error_code == 'InvalidChecksum':
+                            result.end_phase(success=False, message="Checksum validation failed", 
+                                          error=e)
+                        else:
+                            result.end_phase(success=False, message="Upload failed", error=e)
                         raise UploadError(result.phases[-1])
+                    except Exception as e:
+                        # Any other worker failure still belongs to this part and must abort
+                        result.end_phase(success=False, message="Upload failed", error=e)
+                        raise UploadError(result.phases[-1])
+                    
+                    if verbose:
+                        # Dumped and verified here, one part at a time, so workers' output never interleaves
+                        print_verbose(f"Upload Part {done_part_number} Response:", response, verbose)
+                    
+                    # Identical base64 means identical CRC; only decode for diagnostics or a mismatch
+                    if verbose or response.get(checksum_key) != checksum:
+                        success, error_msg = verify_part_checksum(response, chunk, checksum, verbose,
+                                                                  algorithms=(checksum_algorithm,))
+                        if not success:
+                            result.end_phase(success=False, message=error_msg)
+                            raise UploadError(result.phases[-1])
                     
-                    parts.append({
-                        'ETag': response['ETag'],
-                        'PartNumber': part_number,
-                        'ChecksumCRC32': checksum
-                    })
+                    if done_part_number > len(parts):
+                        parts.extend([None] * (done_part_number - len(parts)))
+                    parts[done_part_number - 1] = CompletedPart(response['ETag'], done_part_number, crc32_val)
                     
                     bytes_sent += len(chunk)
                     result.end_phase(message=f"Uploaded and verified ({bytes_sent}/{file_size} bytes)")
-                    logger.info(f"✓ Part {part_number} uploaded and verified ({bytes_sent}/{file_size} bytes)")
-                    part_number += 1
-                    
-                except ClientError as e:
-                    error_code = e.response.get('Error', {}).get('Code', '')
-                    if error_code == 'InvalidChecksum':
-                        result.end_phase(success=False, message="Checksum validation failed", 
-                                      error=e)
+                    logger.info(f"✓ Part {done_part_number} uploaded and verified ({bytes_sent}/{file_size} bytes)")
+                    del in_flight[future]
+                    if isinstance(chunk, bytearray):
+                        free_buffers.append(chunk)
                     else:
-                        result.end_phase(success=False, message="Upload failed", error=e)
-                    raise UploadError(result.phases[-1])
+                        chunk.release()
+            
+            if file_view is not None:
+                part_source = iter_mapped_parts(file_view, part_size)
+            else:
+                part_source = iter_buffered_parts(data_source, buffer_size, free_buffers, crc_func)
+            
+            part_count = 0
+            with ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS) as executor:
+                for part_number, (chunk, crc32_val) in enumerate(part_source, 1):
+                    part_count = part_number
+                    logger.info(f"Uploading part {part_number}...")
+                    future = executor.submit(
+                        upload_one_part, s3, target_bucket, destination_key, upload_id,
+                        part_number, chunk, crc32_val, checksum_algorithm
+                    )
+                    in_flight[future] = (part_number, chunk)
+                    
+                    # Bound in-flight memory: block the reader until a part finishes
+                    if len(in_flight) >= MAX_UPLOAD_WORKERS:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect_parts(done)
+                
+                collect_parts(wait(in_flight).done)
+            del parts[part_count:]
         
         finally:
-            if is_file and isinstance(data_source, (IOBase, BytesIO)):
+            # Every view must be released before the mapping can be closed
+            for _, chunk in in_flight.values():
+                if isinstance(chunk, memoryview):
+                    chunk.release()
+            if file_view is not None:
+                file_view.release()
+            if owns_source:
                 data_source.close()
         
+        completed_parts = [part.to_dict(checksum_key) for part in parts]
+        
         logger.info("\nCompleting multipart upload...")
         result.start_phase(UploadStage.COMPLETION.value)
         try:
@@ -380,7 +663,7 @@ def multipart_upload(target_bucket: str,
                 Bucket=target_bucket,
                 Key=destination_key,
                 UploadId=upload_id,
-                MultipartUpload={'Parts': parts}
+                MultipartUpload={'Parts': completed_parts}
             )
             result.end_phase(message="Upload completed successfully")
         except Exception as e:
@@ -393,7 +676,8 @@ def multipart_upload(target_bucket: str,
         
         logger.info("\nVerifying complete upload with checksums...")
         result.start_phase(UploadStage.VERIFICATION.value)
-        success, error_msg = verify_uploaded_object(s3, target_bucket, destination_key, parts, verbose)
+        success, error_msg = verify_uploaded_object(s3, target_bucket, destination_key, completed_parts, verbose,
+                                                    checksum_algorithm, part_crcs=[part.CRC for part in parts])
         if success:
             result.end_phase(message="All checksums verified successfully")
             logger.info("✓ Upload verified successfully with all checksums matching!")
@@ -446,10 +730,18 @@ def main():
     parser.add_argument('--secret-key', help='AWS secret key')
     parser.add_argument('--region', help='AWS region')
     parser.add_argument('--profile', help='AWS credentials profile name')
+    parser.add_argument('--part-size-mb', type=int,
+                       help='Part size in MiB (default: 16 for files over 1 GiB, otherwise 8; '
+                            'raised as needed to stay within 10,000 parts)')
+    parser.add_argument('--checksum-algorithm', choices=sorted(CHECKSUM_KEYS), default='crc32',
+                       help='Part checksum algorithm (crc32c requires the crc32c package)')
     parser.add_argument('-v', '--verbose', action='store_true', 
                        help='Enable verbose output with API responses')
     
     args = parser.parse_args()
+    
+    if args.part_size_mb is not None and args.part_size_mb * MiB < MIN_PART_SIZE:
+        parser.error(f"--part-size-mb must be at least {MIN_PART_SIZE // MiB}")
 
     if args.verbose:
         logger.setLevel(logging.DEBUG)
@@ -461,14 +753,6 @@ def main():
     # Environment variable takes precedence over command line argument
     endpoint_url = os.environ.get('S3_ENDPOINT') or args.endpoint_url
     
-    client = create_s3_client(
-        endpoint_url=endpoint_url,
-        access_key=args.access_key,
-        secret_key=args.secret_key,
-        region=args.region,
-        profile=args.profile
-    )
-    
     try:
         if args.file:
             file_path = os.path.expanduser(args.file)
@@ -491,7 +775,9 @@ def main():
             aws_secret_access_key=args.secret_key,
             region_name=args.region,
             profile_name=args.profile,
-            verbose=args.verbose
+            verbose=args.verbose,
+            part_size=args.part_size_mb * MiB if args.part_size_mb else None,
+            checksum_algorithm=args.checksum_algorithm
         )
         
         if result.error:
@@ -8,6 +8,8 @@ import boto3
 import zlib
 import base64
 import struct
+import threading
+from botocore.exceptions import ClientError
 from botocore.stub import Stubber
 from botocore.response import StreamingBody
 from io import BytesIO
@@ -15,6 +17,16 @@ from io import BytesIO
 # Ensure the python module is in the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """
+    A client cached by an earlier test would bypass the patched boto3.Session.
+    """
+    from python.integrity import _cached_client
+    _cached_client.cache_clear()
+    yield
+    _cached_client.cache_clear()
+
 @pytest.fixture(scope="function")
 def s3_client():
     """
@@ -51,6 +63,71 @@ def test_data():
         'final_checksum': multipart_checksum
     }
 
+class FakeS3Client:
+    """
+    Thread-safe in-memory stand-in for the multipart calls, for uploads whose parts
+    complete in nondeterministic order. Part numbers listed in fail_parts are rejected;
+    those in corrupt_parts are accepted but echo back the wrong checksum, and those in
+    crash_parts raise a non-botocore exception.
+    """
+    def __init__(self, fail_parts=(), corrupt_parts=(), crash_parts=()):
+        self.fail_parts = set(fail_parts)
+        self.corrupt_parts = set(corrupt_parts)
+        self.crash_parts = set(crash_parts)
+        self.bodies = {}
+        self.completed_parts = None
+        self.aborted_upload_ids = []
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, **kwargs):
+        return {'UploadId': 'fake-upload-id'}
+
+    def upload_part(self, **kwargs):
+        part_number = kwargs['PartNumber']
+        if part_number in self.fail_parts:
+            raise ClientError({'Error': {'Code': 'InternalError', 'Message': 'injected'}}, 'UploadPart')
+        if part_number in self.crash_parts:
+            raise TypeError("injected")
+        body = kwargs['Body']
+        data = body.read() if hasattr(body, 'read') else bytes(body)
+        with self._lock:
+            self.bodies[part_number] = data
+        crc = zlib.crc32(data) ^ (1 if part_number in self.corrupt_parts else 0)
+        checksum = base64.b64encode(struct.pack('>I', crc)).decode('utf-8')
+        return {'ETag': f'"etag-{part_number}"', 'ChecksumCRC32': checksum}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed_parts = kwargs['MultipartUpload']['Parts']
+        return {'ETag': '"final-etag"'}
+
+    def head_object(self, **kwargs):
+        crc_bytes = b''.join(base64.b64decode(part['ChecksumCRC32']) for part in self.completed_parts)
+        checksum = base64.b64encode(struct.pack('>I', zlib.crc32(crc_bytes))).decode('utf-8')
+        return {'ChecksumCRC32': f"{checksum}-{len(self.completed_parts)}"}
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted_upload_ids.append(kwargs['UploadId'])
+        return {}
+
+@pytest.fixture(scope="function")
+def fake_s3_client():
+    """
+    Fixture that provides a factory for FakeS3Client instances.
+    Call it with fail_parts, corrupt_parts or crash_parts to make those part numbers misbehave.
+    """
+    return FakeS3Client
+
+@pytest.fixture(scope="function")
+def upload_file(tmp_path):
+    """
+    Fixture that provides a temporary file spanning several 1 KiB parts plus a short tail.
+    Returns a tuple of (path, data).
+    """
+    data = os.urandom(5 * 1024 + 123)
+    path = tmp_path / "upload.bin"
+    path.write_bytes(data)
+    return str(path), data
+
 @pytest.fixture(scope="function")
 def sample_data():
     """
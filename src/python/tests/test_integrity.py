@@ -1,17 +1,34 @@
 import pytest
 import boto3
-from unittest.mock import patch
-from botocore.stub import Stubber
-from botocore.response import StreamingBody
+import zlib
+import base64
+import struct
+import mmap
+import json
+from boto3.s3.transfer import TransferConfig
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ProfileNotFound
+from botocore.stub import Stubber, ANY
 from io import BytesIO
 from python.integrity import (
     compute_crc32,
+    compute_sha256,
     compute_multipart_crc32,
+    combine_multipart_checksums,
+    combine_part_crcs,
+    choose_part_size,
+    read_part_with_crc32,
+    iter_mapped_parts,
+    iter_buffered_parts,
+    PartReader,
     verify_part_checksum,
     verify_uploaded_object,
     multipart_upload,
     UploadError,
-    UploadStage
+    UploadStage,
+    DateTimeEncoder,
+    _cached_client,
+    _crc32
 )
 
 def test_compute_crc32(sample_data):
@@ -20,6 +37,15 @@ def test_compute_crc32(sample_data):
     assert isinstance(checksum, str)
     assert len(checksum) > 0
 
+def test_crc32_backend_accepts_buffers(sample_data):
+    """Test the selected CRC32 backend takes memoryview and bytearray slices like zlib"""
+    expected = zlib.crc32(sample_data)
+    with memoryview(sample_data) as view:
+        assert _crc32(view) == expected
+        assert _crc32(view[5:], _crc32(view[:5])) == expected
+    assert _crc32(bytearray(sample_data)) == expected
+    assert _crc32(bytearray(sample_data)[5:], zlib.crc32(sample_data[:5])) == expected
+
 def test_compute_multipart_crc32():
     """Test CRC32 computation for multiple parts"""
     parts = [b"part1", b"part2", b"part3"]
@@ -27,6 +53,60 @@ def test_compute_multipart_crc32():
     assert isinstance(checksum, str)
     assert len(checksum) > 0
 
+def test_compute_multipart_crc32_matches_zlib():
+    """Test chained CRC32 over parts matches a single zlib CRC32 of the whole data"""
+    parts = [b"part1", b"part2", b"part3"]
+    expected = base64.b64encode(struct.pack('>I', zlib.crc32(b"".join(parts)))).decode('utf-8')
+    assert compute_multipart_crc32(parts) == expected
+    assert compute_multipart_crc32(part for part in parts) == expected
+    assert compute_multipart_crc32(iter(parts[:1])) == compute_crc32(parts[0])
+    assert compute_multipart_crc32([]) == compute_crc32(b"")
+
+def test_read_part_with_crc32(sample_data):
+    """Test the fused read + CRC32 fills the buffer across several blocks"""
+    buffer = bytearray(len(sample_data) + 10)
+    bytes_read, crc32_val = read_part_with_crc32(BytesIO(sample_data), buffer, block_size=7)
+    assert bytes_read == len(sample_data)
+    assert buffer[:bytes_read] == sample_data
+    assert crc32_val == zlib.crc32(sample_data)
+
+def test_iter_parts(sample_data):
+    """Test both part generators split the data identically, including the short tail"""
+    with memoryview(sample_data) as view:
+        mapped = [bytes(chunk) for chunk, crc in iter_mapped_parts(view, 10)]
+    buffered = [(bytes(chunk), crc) for chunk, crc in iter_buffered_parts(BytesIO(sample_data), 10, [])]
+    assert b''.join(mapped) == sample_data
+    assert mapped == [chunk for chunk, _ in buffered]
+    assert all(crc == zlib.crc32(chunk) for chunk, crc in buffered)
+
+def test_combine_multipart_checksums():
+    """Test the composite checksum is the CRC32 of the concatenated part CRC32s"""
+    part_checksums = [compute_crc32(part) for part in (b"part1", b"part2", b"part3")]
+    expected_crc = 0
+    for checksum in part_checksums:
+        expected_crc = zlib.crc32(base64.b64decode(checksum), expected_crc)
+    expected = base64.b64encode(struct.pack('>I', expected_crc)).decode('utf-8')
+    assert combine_multipart_checksums(part_checksums) == expected
+    assert combine_part_crcs([zlib.crc32(part) for part in (b"part1", b"part2", b"part3")]) == expected_crc
+
+def test_choose_part_size():
+    """Test part size switches to 16 MiB over 1 GiB and grows to stay within 10,000 parts"""
+    assert choose_part_size(0) == 8 * 1024 * 1024
+    assert choose_part_size(1024 ** 3) == 8 * 1024 * 1024
+    assert choose_part_size(1024 ** 3 + 1) == 16 * 1024 * 1024
+    assert choose_part_size(10000 * 16 * 1024 * 1024) == 16 * 1024 * 1024
+    assert choose_part_size(10000 * 16 * 1024 * 1024 + 1) == 17 * 1024 * 1024
+    assert -(-1024 ** 4 // choose_part_size(1024 ** 4)) <= 10000
+
+def test_part_reader(sample_data):
+    """Test PartReader streams a memoryview and can be rewound for retries"""
+    reader = PartReader(memoryview(sample_data))
+    assert len(reader) == len(sample_data)
+    assert reader.read(5) + reader.read() == sample_data
+    assert reader.read() == b""
+    reader.seek(0)
+    assert reader.read() == sample_data
+
 def test_verify_part_checksum_success(sample_data):
     """Test successful checksum verification for a single part"""
     checksum = compute_crc32(sample_data)
@@ -42,6 +122,29 @@ def test_verify_part_checksum_failure(sample_data):
     assert not success
     assert "CRC32 mismatch" in error_msg
 
+def test_verify_part_checksum_sha256_opt_in(sample_data):
+    """Test SHA256 is only verified when requested"""
+    checksum = compute_crc32(sample_data)
+    response = {'ChecksumCRC32': checksum, 'ChecksumSHA256': compute_sha256(b"wrong data")}
+    success, _ = verify_part_checksum(response, sample_data, checksum)
+    assert success
+    success, error_msg = verify_part_checksum(response, sample_data, checksum,
+                                              algorithms=('crc32', 'sha256'))
+    assert not success
+    assert "SHA256 mismatch" in error_msg
+
+def test_verify_part_checksum_crc32c(sample_data):
+    """Test CRC32C parts are checked against ChecksumCRC32C"""
+    crc32c = pytest.importorskip("crc32c")
+    checksum = base64.b64encode(struct.pack('>I', crc32c.crc32c(sample_data))).decode('utf-8')
+    response = {'ChecksumCRC32C': checksum}
+    success, _ = verify_part_checksum(response, sample_data, checksum, algorithms=('crc32c',))
+    assert success
+    response = {'ChecksumCRC32C': compute_crc32(sample_data)}
+    success, error_msg = verify_part_checksum(response, sample_data, checksum, algorithms=('crc32c',))
+    assert not success
+    assert "CRC32C mismatch" in error_msg
+
 @pytest.mark.asyncio
 async def test_multipart_upload_success(s3_client, test_data):
     """Test successful multipart upload with all phases"""
@@ -67,11 +170,18 @@ async def test_multipart_upload_success(s3_client, test_data):
             'Key': test_key,
             'UploadId': upload_id,
             'PartNumber': 1,
-            'Body': test_data['data'],
+            # A reader over the caller's bytes; its contents are checked via sent_bodies
+            'Body': ANY,
             'ChecksumCRC32': test_data['part_checksum']
         }
     )
     
+    sent_bodies = []
+    def capture_body(params, **kwargs):
+        sent_bodies.append(params['Body'].read())
+        params['Body'].seek(0)
+    client.meta.events.register('provide-client-params.s3.UploadPart', capture_body)
+    
     stubber.add_response(
         'complete_multipart_upload',
         {
@@ -95,11 +205,9 @@ async def test_multipart_upload_success(s3_client, test_data):
         }
     )
     
-    verify_stream = BytesIO(test_data['data'])
     stubber.add_response(
-        'get_object',
+        'head_object',
         {
-            'Body': StreamingBody(verify_stream, test_data['size']),
             'ContentLength': test_data['size'],
             'ChecksumCRC32': test_data['final_checksum'],
             'ETag': '"test-etag"'
@@ -132,14 +240,13 @@ async def test_multipart_upload_success(s3_client, test_data):
             )
             
             assert len(status.phases) >= 3, f"Expected at least 3 phases but got {len(status.phases)}"
+            assert sent_bodies == [test_data['data']]
             failed_phases = [phase for phase in status.phases if not phase.success]
             assert not failed_phases, f"Failed phases:\n" + "\n".join(
                 f"- {phase.stage}: {phase.message}" for phase in failed_phases
             )
     except Exception as e:
         pytest.fail(f"Unexpected error: {str(e)}")
-    finally:
-        verify_stream.close()
 
 def test_verify_uploaded_object(s3_client, test_data):
     """Test verification of a previously uploaded object"""
@@ -147,11 +254,9 @@ def test_verify_uploaded_object(s3_client, test_data):
     test_bucket = "tester"
     test_key = "test/file.txt"
     
-    verify_stream = BytesIO(test_data['data'])
     stubber.add_response(
-        'get_object',
+        'head_object',
         {
-            'Body': StreamingBody(verify_stream, test_data['size']),
             'ContentLength': test_data['size'],
             'ChecksumCRC32': test_data['final_checksum'],
             'ETag': '"test-etag"'
@@ -169,9 +274,122 @@ def test_verify_uploaded_object(s3_client, test_data):
         'ChecksumCRC32': test_data['part_checksum']
     }]
     
-    try:
-        success, error = verify_uploaded_object(client, test_bucket, test_key, parts)
-        assert success, f"Verification failed: {error}"
-        assert error is None, f"Unexpected error: {error}"
-    finally:
-        verify_stream.close()
+    success, error = verify_uploaded_object(client, test_bucket, test_key, parts)
+    assert success, f"Verification failed: {error}"
+    assert error is None, f"Unexpected error: {error}"
+
+class FailingMmap(mmap.mmap):
+    def __new__(cls, *args, **kwargs):
+        raise OSError("mmap unavailable")
+
+@pytest.mark.parametrize("mmap_fails", [False, True], ids=["mapped", "unbuffered"])
+def test_multipart_upload_file(upload_file, fake_s3_client, mmap_fails):
+    """Test a file upload split into concurrent parts, mapped or read unbuffered"""
+    path, data = upload_file
+    client = fake_s3_client()
+    
+    with patch('boto3.Session') as mock_session, \
+         patch('python.integrity.mmap.mmap', FailingMmap if mmap_fails else mmap.mmap):
+        mock_session.return_value.client.return_value = client
+        status = multipart_upload(
+            target_bucket="tester",
+            source_data=path,
+            destination_key="test/file.bin",
+            part_size=1024
+        )
+    
+    assert all(phase.success for phase in status.phases)
+    assert sorted(client.bodies) == list(range(1, 7))
+    assert b''.join(client.bodies[n] for n in sorted(client.bodies)) == data
+    assert [part['PartNumber'] for part in client.completed_parts] == list(range(1, 7))
+    assert [part['ETag'] for part in client.completed_parts] == [f'"etag-{n}"' for n in range(1, 7)]
+    assert not client.aborted_upload_ids
+
+@pytest.mark.parametrize("failure", ["fail_parts", "crash_parts"])
+def test_multipart_upload_file_part_failure_aborts(upload_file, fake_s3_client, failure):
+    """Test a failing part aborts the upload and still releases the mapped file"""
+    path, _ = upload_file
+    client = fake_s3_client(**{failure: {3}})
+    
+    with patch('boto3.Session') as mock_session:
+        mock_session.return_value.client.return_value = client
+        with pytest.raises(UploadError) as exc_info:
+            multipart_upload(
+                target_bucket="tester",
+                source_data=path,
+                destination_key="test/file.bin",
+                part_size=1024
+            )
+    
+    assert exc_info.value.phase.stage == UploadStage.PART_UPLOAD.value
+    assert exc_info.value.phase.part_number == 3
+    assert client.aborted_upload_ids == ["fake-upload-id"]
+    assert client.completed_parts is None
+
+def test_cached_client_uses_profile():
+    """Test the cached client is built from the requested profile's session"""
+    with patch('boto3.Session') as mock_session:
+        client = _cached_client(region='us-west-2', profile='other')
+        assert _cached_client(region='us-west-2', profile='other') is client
+    mock_session.assert_called_once_with(profile_name='other')
+
+def test_cached_client_missing_profile_falls_back():
+    """Test a missing profile falls back to default credentials with a single session"""
+    default_session = MagicMock(region_name='us-east-1')
+    def make_session(profile_name=None):
+        if profile_name == 'nope':
+            raise ProfileNotFound(profile='nope')
+        return default_session
+    
+    with patch('boto3.Session', side_effect=make_session) as mock_session:
+        client = _cached_client(profile='nope')
+    
+    assert client is default_session.client.return_value
+    assert mock_session.call_count == 2  # The failed profile lookup, then the default
+    assert default_session.client.call_args.kwargs['config'].region_name == 'us-east-1'
+
+def test_datetime_encoder_transfer_config():
+    """Test TransferConfig instances are stringified but arbitrary classes are not"""
+    assert json.loads(json.dumps({'config': TransferConfig()}, cls=DateTimeEncoder))['config'].startswith('<')
+    with pytest.raises(TypeError):
+        json.dumps({'cls': int}, cls=DateTimeEncoder)
+
+def test_multipart_upload_part_checksum_mismatch_aborts(upload_file, fake_s3_client):
+    """Test a part whose returned checksum differs fails verification and aborts"""
+    path, _ = upload_file
+    client = fake_s3_client(corrupt_parts={2})
+    
+    with patch('boto3.Session') as mock_session:
+        mock_session.return_value.client.return_value = client
+        with pytest.raises(UploadError) as exc_info:
+            multipart_upload(
+                target_bucket="tester",
+                source_data=path,
+                destination_key="test/file.bin",
+                part_size=1024
+            )
+    
+    assert exc_info.value.phase.part_number == 2
+    assert exc_info.value.phase.message.startswith("CRC32 mismatch")
+    assert client.aborted_upload_ids == ["fake-upload-id"]
+
+@pytest.mark.parametrize("size_error", [-1500, 1500], ids=["grew", "shrank"])
+def test_multipart_upload_unmapped_file_size_change(upload_file, fake_s3_client, size_error):
+    """Test the read-to-EOF path uploads every part even if the stat'd size is stale"""
+    path, data = upload_file
+    client = fake_s3_client()
+    
+    with patch('boto3.Session') as mock_session, \
+         patch('python.integrity.mmap.mmap', FailingMmap), \
+         patch('python.integrity.os.path.getsize', return_value=len(data) + size_error):
+        mock_session.return_value.client.return_value = client
+        status = multipart_upload(
+            target_bucket="tester",
+            source_data=path,
+            destination_key="test/file.bin",
+            part_size=1024
+        )
+    
+    assert all(phase.success for phase in status.phases)
+    assert b''.join(client.bodies[n] for n in sorted(client.bodies)) == data
+    assert [part['PartNumber'] for part in client.completed_parts] == list(range(1, 7))